@@ -1,7 +1,7 @@
 """Contains various helper functions useful in conjunction with or internally to jointly."""
 import logging
 from pprint import pprint
-from typing import List, Tuple, Iterable
+from typing import Dict, List, Optional, Tuple, Iterable, Union
 
 import numpy as np
 import pandas as pd
@@ -21,42 +21,114 @@ def calculate_magnitude(
     Will return 0 if the input data is NaN to allow future algorithms
     to continue working despite the NaN in the input values.
     """
-    data = df[of_cols]
-    result = np.sqrt(np.square(data).sum(axis=1))
-    result.name = title
-    return result.to_frame(name=title)
+    data = df[of_cols].to_numpy(dtype=np.float64, na_value=0.0)
+    # fuse squaring and summing the columns into a single pass
+    result = np.sqrt(np.einsum("ij,ij->i", data, data))
+    return pd.DataFrame({title: result}, index=df.index)
 
 
 def normalize(x: List[float]):
     """Normalizes signal to interval [-1, 1] with mean 0."""
+    if not isinstance(x, (np.ndarray, pd.Series)):
+        # convert lists once, instead of letting each numpy call convert them again
+        x = np.asarray(x, dtype=np.float64)
     if len(x) <= 1:
         raise ValueError("Cannot normalize list with less than 2 entries")
     x_centered = x - np.mean(x)
-    x_maximum = np.max(np.abs(x_centered))
+    # avoid allocating a temporary array of absolute values
+    x_maximum = max(x_centered.max(), -x_centered.min())
     if x_maximum == 0:
         raise ZeroDivisionError("input vector is all-zero")
-    x_normalized = x_centered / x_maximum
-    return x_normalized
+    x_centered /= x_maximum
+    return x_centered
 
 
-def get_equidistant_signals(signals: pd.DataFrame, frequency: float):
+def get_equidistant_signals(
+    signals: pd.DataFrame,
+    frequency: float,
+    resampled_columns: Optional[Dict[str, pd.Series]] = None,
+    index_cache: Optional[Dict[Tuple, pd.DatetimeIndex]] = None,
+):
     """
     Returns dataframe with columns from ``signals`` sampled equidistantly at the specified frequency.
 
     :param signals: the columns of this dataframe will be independently resampled
     :param frequency: the target frequency in Hz
+    :param resampled_columns: columns that have already been resampled at ``frequency`` before, e.g., by a previous
+           call to this function, and can be reused as they are instead of resampling them again
+    :param index_cache: optional dictionary in which the equidistant index is stored, so that repeated calls for the
+           same time range and frequency, e.g., by the same ``Synchronizer``, can reuse it instead of allocating it anew
     :return: equidistantly sampled dataframe
     """
-    freq = "{}N".format(int(1e9 / frequency))
+    if resampled_columns is None:
+        resampled_columns = {}
+    freq_ns = int(1e9 / frequency)
+    freq = "{}N".format(freq_ns)
     df = pd.DataFrame(
-        {col: signals[col].dropna().resample(freq).nearest() for col in signals.columns}
+        {
+            col: resampled_columns[col]
+            if col in resampled_columns
+            else _resample_nearest(signals[col].dropna(), freq_ns)
+            for col in signals.columns
+        }
     )
-    index = pd.date_range(
-        start=pd.to_datetime(df.index.min(), unit="s"),
-        end=pd.to_datetime(df.index.max(), unit="s"),
-        freq=freq,
+    start = pd.to_datetime(df.index.min(), unit="s")
+    end = pd.to_datetime(df.index.max(), unit="s")
+    if index_cache is None:
+        return df.set_index(pd.date_range(start=start, end=end, freq=freq))
+
+    # timestamps of the same instant in different timezones are equal, so the timezone is part of the key
+    key = (start, end, start.tz, freq)
+    if key not in index_cache:
+        index_cache[key] = pd.date_range(start=start, end=end, freq=freq)
+    return df.set_index(index_cache[key])
+
+
+def _resample_nearest(series: pd.Series, freq_ns: int) -> pd.Series:
+    """
+    Equivalent of ``series.resample(freq).nearest()`` for a sorted series without NaN, that looks up the nearest
+    samples with a binary search on the int64 index instead of going through the resampler and reindexing machinery.
+
+    :param series: sorted series without NaN values
+    :param freq_ns: the target sampling period in nanoseconds
+    :return: the series resampled to the bins ``resample`` would produce, i.e., anchored at midnight of the first day
+    """
+    index_ns = series.index.asi8
+    if len(index_ns) == 0:
+        return series.resample("{}N".format(freq_ns)).nearest()
+
+    origin_ns = series.index[0].normalize().value
+    first_ns = index_ns[0] - (index_ns[0] - origin_ns) % freq_ns
+    labels_ns = np.arange(first_ns, index_ns[-1] + 1, freq_ns)
+
+    if len(index_ns) == len(labels_ns) >= 3 and (np.diff(index_ns) == freq_ns).all():
+        # like pandas, keep the samples as they are if they already have the target frequency
+        positions = np.arange(len(index_ns))
+    else:
+        # choose the closer one of the neighbouring samples, the later one on ties
+        right = np.searchsorted(index_ns, labels_ns)
+        left = np.maximum(right - 1, 0)
+        right = np.minimum(right, len(index_ns) - 1)
+        positions = np.where(
+            labels_ns - index_ns[left] < index_ns[right] - labels_ns, left, right
+        )
+
+    return pd.Series(
+        series.array.take(positions),
+        index=_get_datetime_index(labels_ns, series.index),
+        name=series.name,
     )
-    return df.set_index(index)
+
+
+def _get_datetime_index(
+    timestamps: np.ndarray, like: pd.DatetimeIndex
+) -> pd.DatetimeIndex:
+    """
+    Wrap int64 UTC nanosecond timestamps in a DatetimeIndex with the timezone and name of ``like``. Viewing them as
+    datetime64 is much cheaper than having ``pd.to_datetime`` convert them element by element.
+    """
+    index = pd.DatetimeIndex(timestamps.view("M8[ns]"), tz="UTC", name=like.name)
+    return index.tz_convert(like.tz)
 
 
 def get_max_ref_frequency(signals: pd.DataFrame) -> float:
@@ -71,8 +143,17 @@ def get_max_ref_frequency(signals: pd.DataFrame) -> float:
     if len(signals.columns) == 0:
         raise ValueError("Can't get the max frequency of 0 columns")
 
-    frequencies = signals.aggregate(infer_freq)
-    return np.amax(frequencies)
+    # columns without gaps share the frequency of the index, so it only has to be inferred once for them
+    index_ns = signals.index.asi8
+    valid = signals.notna().to_numpy()
+    complete = valid.all(axis=0)
+    frequencies = [
+        _infer_freq_from_ns(index_ns[mask]) for mask in valid[:, ~complete].T
+    ]
+    if complete.any():
+        frequencies.append(_infer_freq_from_ns(index_ns))
+    # columns with less than two values have no frequency
+    return np.nanmax(frequencies)
 
 
 def infer_freq(series: pd.Series) -> float:
@@ -82,27 +163,51 @@ def infer_freq(series: pd.Series) -> float:
     :param series: the frequency of this series will be inferred
     :return: frequency, as a float, measured in Hz
     """
-    index = series.dropna().index
-    time_deltas = index[1:] - index[:-1]
-    median = np.median(time_deltas)
-    return np.timedelta64(1, "s") / median
+    # select the timestamps of the valid values directly instead of copying the series with dropna
+    return _infer_freq_from_ns(series.index.asi8[series.notna().to_numpy()])
+
+
+def _infer_freq_from_ns(timestamps: np.ndarray) -> float:
+    """Infer the frequency in Hz from sorted int64 nanosecond timestamps, NaN if there are less than two"""
+    if len(timestamps) < 2:
+        return np.nan
+    time_deltas = np.diff(timestamps)
+    # median in whole nanoseconds, just like a median of timedeltas
+    median = int(np.median(time_deltas))
+    if median == 0:
+        return np.inf
+    return 1e9 / median
 
 
 def stretch_signals(
-    source: pd.DataFrame, factor: float, start_time: pd.DatetimeIndex
-) -> pd.DataFrame:
+    source: Union[pd.DataFrame, pd.Series], factor: float, start_time: pd.Timestamp
+) -> Union[pd.DataFrame, pd.Series]:
     """
-    Returns a copy of DataFrame with stretched DateTimeIndex.
+    Returns a shallow copy of DataFrame or Series with stretched DateTimeIndex.
+    Only the index is rebuilt, the data is shared with ``source``.
 
-    :param source: the index of this DataFrame will be stretched.
+    :param source: the index of this DataFrame or Series will be stretched.
     :param factor: the factor by which to streth the DateTimeIndex
     :param start_time: first index, i.e., time, in the dataframe
-    :return: copy of the dataframe with stretched index
+    :return: shallow copy of the dataframe or series with stretched index
     """
-    timedelta = source.index - start_time
-    new_index = timedelta * factor + start_time
-    df = source.set_index(new_index, verify_integrity=True)
-    return df
+    if factor <= 0:
+        raise ValueError(f"Stretch factor must be positive, but is {factor}")
+    start_time = pd.Timestamp(start_time)
+    if (start_time.tz is None) != (source.index.tz is None):
+        raise TypeError(
+            "Cannot stretch with a start time and index that are not both tz-naive or both tz-aware"
+        )
+    # a positive factor keeps the order of the index, thus it stays unique
+    start_ns = start_time.value
+    # reuse the buffers in place, this only allocates one int64 and one float64 array
+    stretched_ns = source.index.asi8 - start_ns
+    offsets = np.multiply(stretched_ns, factor)
+    np.copyto(stretched_ns, offsets, casting="unsafe")
+    stretched_ns += start_ns
+    stretched = source.copy(deep=False)
+    stretched.index = _get_datetime_index(stretched_ns, source.index)
+    return stretched
 
 
 def get_stretch_factor(
@@ -119,25 +224,30 @@ def get_stretch_factor(
     :param timeshifts: the timeshifts that should be applied to make the signal align to the reference signal
     :return: a float as described above
     """
-    old_length = segments["second"]["start"] - segments["first"]["start"]
-    new_length = old_length + timeshifts["second"] - timeshifts["first"]
+    # calculate in integer nanoseconds instead of boxing intermediate Timedelta objects
+    old_length = segments["second"]["start"].value - segments["first"]["start"].value
+    new_length = old_length + timeshifts["second"].value - timeshifts["first"].value
     stretch_factor = new_length / old_length
     return stretch_factor
 
 
+_SYNC_POINT_PARTS = frozenset(["start", "end"])
+
+
 def verify_segments(signals: Iterable[str], segments: SyncPairs):
     """Verify that two synchronization points (i.e., start and end) have been found for each signal."""
     for signal in signals:
+        sync_pair = segments.get(signal, {})
         for segment in ["first", "second"]:
-            for part in ["start", "end"]:
-                try:
-                    segments[signal][segment][part]
-                except KeyError:
-                    print("Dumping all detected segments:")
-                    pprint(segments)
-                    raise ShakeMissingException(
-                        f"No {segment} shake detected for {signal}, missing the {part}"
-                    )
+            sync_point = sync_pair.get(segment, {})
+            if _SYNC_POINT_PARTS.issubset(sync_point):
+                continue
+            part = next(part for part in ["start", "end"] if part not in sync_point)
+            print("Dumping all detected segments:")
+            pprint(segments)
+            raise ShakeMissingException(
+                f"No {segment} shake detected for {signal}, missing the {part}"
+            )
 
 
 def get_segment_data(
@@ -23,6 +23,22 @@ def _get_shake_weight(x: List[pd.DatetimeIndex]):
     return np.median(x) + np.mean(x)
 
 
+def _find_peaks_above(values: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Returns the same peak positions as ``scipy.signal.find_peaks(values, height=threshold)``,
+    but only searches the samples reaching the threshold and their direct neighbours.
+    Whether a sample is a peak only depends on its plateau and the samples next to it, and every sample
+    of a peak plateau reaches the threshold, so all other samples can be skipped.
+    """
+    above = values >= threshold
+    candidates = above.copy()
+    candidates[1:] |= above[:-1]
+    candidates[:-1] |= above[1:]
+    positions = np.flatnonzero(candidates)
+    peaks, _ = scipy.signal.find_peaks(values[positions], height=threshold)
+    return positions[peaks]
+
+
 class ShakeExtractor(AbstractExtractor):
     def __init__(self):
         super().__init__()
@@ -121,14 +137,17 @@ class ShakeExtractor(AbstractExtractor):
         """
         logger.debug(f"Using peak threshold {self.threshold}")
 
+        # the index is sorted, so the windows can be sliced positionally
+        values = signals[column].to_numpy()
+
         # find peaks in start window
-        start_part = signals[column].truncate(after=start_window)
-        peaks_start, _ = scipy.signal.find_peaks(start_part, height=self.threshold)
+        start_part_end = signals.index.searchsorted(start_window, side="right")
+        peaks_start = _find_peaks_above(values[:start_part_end], self.threshold)
 
         # find peaks in end window
-        end_part = signals[column].truncate(before=end_window)
-        peaks_end, _ = scipy.signal.find_peaks(end_part, height=self.threshold)
-        peaks_end += signals.index.get_loc(end_part.index[0])
+        end_part_start = signals.index.searchsorted(end_window, side="left")
+        peaks_end = _find_peaks_above(values[end_part_start:], self.threshold)
+        peaks_end += end_part_start
 
         peaks = [*peaks_start, *peaks_end]
         logger.debug("Found {} peaks for {}".format(len(peaks), column))
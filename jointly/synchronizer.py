@@ -1,16 +1,54 @@
+import functools
+import logging
 import os
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.signal import correlate
+from scipy.signal import correlate, correlation_lags
 
 from . import ShakeExtractor, helpers
 from .abstract_extractor import AbstractExtractor
-from .helpers import normalize, get_equidistant_signals
+from .helpers import get_equidistant_signals
 from .log import logger
 from .synchronization_errors import StartEqualsEndError
-from .types import SourceDict, ResultTableSpec, SyncPairTimeshift, SyncPairs
+from .types import (
+    SourceDict,
+    ResultTableSpec,
+    SyncPairTimeshift,
+    SyncPairs,
+    SynchronizationPoint,
+)
+
+
+_DIRECT_CORRELATION_MAX_SIZE = 2**20
+"""maximum product of segment lengths for which the direct cross-correlation is faster than the FFT"""
+
+
+def _correlate_segments(ref: np.ndarray, sig: np.ndarray) -> np.ndarray:
+    """
+    Full cross-correlation of two segments. Short segments are correlated directly,
+    longer ones in O(n log n) via FFT.
+    """
+    method = "direct" if len(ref) * len(sig) <= _DIRECT_CORRELATION_MAX_SIZE else "fft"
+    return correlate(ref, sig, mode="full", method=method)
+
+
+def _get_segment_values(
+    column: pd.Series,
+    index_ns: np.ndarray,
+    segment: SynchronizationPoint,
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    """
+    Returns the values of a column from the start to the end of the segment, both inclusive.
+    The bounds are located by a binary search on the int64 view of the sorted index, which avoids
+    label-based slicing and intermediate Series in the timeshift loop.
+    """
+    start = np.searchsorted(index_ns, segment["start"].value, side="left")
+    end = np.searchsorted(index_ns, segment["end"].value, side="right")
+    return np.asarray(column.array[start:end], dtype=dtype)
 
 
 class Synchronizer:
@@ -25,12 +63,16 @@ class Synchronizer:
             raise TypeError("Extractor needs to be a subclass of AbstractExtractor.")
         self._extractor = value
 
+    total_table_chunk_size = 1_000_000
+    """number of rows of the total table that are joined and written at once by ``save_data``"""
+
     def __init__(
         self,
         sources: SourceDict,
         reference_source_name: str,
         extractor: Optional[AbstractExtractor] = None,
         sampling_freq: Optional[float] = None,
+        dtype: type = np.float32,
     ):
         """
         Create a new synchronizer. Synchronizer objects are used to remove offsets and clock offsets by stretching and
@@ -43,13 +85,20 @@ class Synchronizer:
                a ShakeExtractor instance
         :param sampling_freq: Override the frequency used to resample input data. If None, it defaults to the maximum
                input frequency
+        :param dtype: floating point type of the normalized reference signals used to find the synchronization
+               parameters. The default float32 halves the memory moved during resampling and correlation,
+               pass np.float64 for double precision
         """
         self.sources = sources
+        self.dtype = dtype
         self.ref_source_name = reference_source_name
         self._check_sources()
 
         self.extractor = extractor if extractor is not None else ShakeExtractor()
         self.ref_signals = self._prepare_ref_signals()
+        self._synced_data: Optional[Dict[str, pd.DataFrame]] = None
+        # equidistant indexes of this instance, reused e.g. when recalculating
+        self._equidistant_indexes: Dict[Tuple, pd.DatetimeIndex] = {}
 
         self.sampling_freq = (
             sampling_freq
@@ -95,17 +144,33 @@ class Synchronizer:
         Collect the reference columns from all sources and join them into a single dataframe.
         Each reference column is named equal to the name of the source it comes from.
 
-        :return: normalized reference signals
+        :return: normalized reference signals with the dtype ``self.dtype``
         """
-        reference_signals = pd.DataFrame()
-        for source_name, source in self.sources.items():
-            signal = source["data"][source["ref_column"]].dropna()
-            reference_signals = reference_signals.join(signal, how="outer")
-            reference_signals.rename(
-                columns={source["ref_column"]: source_name}, inplace=True
-            )
-        reference_signals = reference_signals.apply(normalize)
-        return reference_signals
+        reference_signals = pd.concat(
+            [
+                source["data"][source["ref_column"]].dropna().rename(source_name)
+                for source_name, source in self.sources.items()
+            ],
+            axis="columns",
+            join="outer",
+            sort=True,
+        )
+
+        # normalize all columns at once, see helpers.normalize
+        values = reference_signals.to_numpy(dtype=np.float64)
+        if (np.count_nonzero(~np.isnan(values), axis=0) <= 1).any():
+            raise ValueError("Cannot normalize list with less than 2 entries")
+        values -= np.nanmean(values, axis=0)
+        maximum = np.nanmax(np.abs(values), axis=0)
+        if (maximum == 0).any():
+            raise ZeroDivisionError("input vector is all-zero")
+        values /= maximum
+
+        return pd.DataFrame(
+            values.astype(self.dtype),
+            index=reference_signals.index,
+            columns=reference_signals.columns,
+        )
 
     @staticmethod
     def _get_timeshift_pair(
@@ -122,63 +187,102 @@ class Synchronizer:
         :return: timeshift to align the first and second synchronization point
                  for the target signal to the reference signal
         """
+        # checked once, so the debug messages are not formatted in vain
+        debug = logger.isEnabledFor(logging.DEBUG)
         timeshifts = {}
+        index_ns = dataframe.index.asi8
+        sample_period = dataframe.index[1] - dataframe.index[0]
+        ref_column, sig_column = dataframe[ref_col], dataframe[sig_col]
         for index, segment in enumerate(["first", "second"]):
-            logger.debug(
-                f"Calculate timeshift of {segment} segment "
-                f"for {sig_col} to {ref_col}."
-            )
+            if debug:
+                logger.debug(
+                    f"Calculate timeshift of {segment} segment "
+                    f"for {sig_col} to {ref_col}."
+                )
 
             # reference signal segment data extraction
-            ref_start, ref_end, ref_data = helpers.get_segment_data(
-                dataframe, segments, ref_col, segment
+            ref_start = segments[ref_col][segment]["start"]
+            sig_start = segments[sig_col][segment]["start"]
+            ref_values = _get_segment_values(
+                ref_column, index_ns, segments[ref_col][segment]
             )
-            sig_start, sig_end, sig_data = helpers.get_segment_data(
-                dataframe, segments, sig_col, segment
+            # calculate cross-correlation in the precision of the reference signal
+            sig_values = _get_segment_values(
+                sig_column, index_ns, segments[sig_col][segment], ref_values.dtype
             )
 
-            # calculate cross-correlation of segments
-            cross_corr = correlate(ref_data, sig_data)
-            shift_in_samples = np.argmax(cross_corr) - len(sig_data) + 1
+            cross_corr = _correlate_segments(ref_values, sig_values)
+            lags = correlation_lags(len(ref_values), len(sig_values), mode="full")
+            max_corr_index = np.argmax(cross_corr)
+            shift_in_samples = lags[max_corr_index]
 
             # get timestamp at which sig_segment must start to sync signals
-            max_corr_ts = dataframe.index[
-                dataframe.index.get_loc(ref_start, method="nearest") + shift_in_samples
-            ]
-            logger.debug(
-                f"Highest correlation with start at "
-                f"{max_corr_ts} with {np.max(cross_corr)}."
-            )
+            max_corr_ts = ref_start + shift_in_samples * sample_period
+            if debug:
+                logger.debug(
+                    f"Highest correlation with start at "
+                    f"{max_corr_ts} with {cross_corr[max_corr_index]}."
+                )
 
             # calculate timeshift to move signal to maximize correlation
             timeshifts[segment] = max_corr_ts - sig_start
-            logger.debug("Timeshift is {}.".format(str(timeshifts[segment])))
+            if debug:
+                logger.debug("Timeshift is {}.".format(str(timeshifts[segment])))
 
         return timeshifts
 
-    def _calculate_stretch_factors(self) -> pd.DataFrame:
+    def _get_timeshift_pairs(
+        self, dataframe: pd.DataFrame, segments: SyncPairs
+    ) -> Dict[str, SyncPairTimeshift]:
+        """
+        Returns the timeshift pairs to synchronize each non-reference signal to the reference signal.
+        The sources are independent of each other, so they are processed in a thread pool.
+
+        :param dataframe: equidistantly sampled reference signal dataframe
+        :param segments: all detected synchronization pairs
+        :return: a dictionary of the timeshift pair for each non-reference source
+        """
+        sources = [col for col in dataframe.columns if col != self.ref_source_name]
+
+        def get_timeshift_pair(source: str) -> SyncPairTimeshift:
+            return Synchronizer._get_timeshift_pair(
+                dataframe, self.ref_source_name, source, segments
+            )
+
+        if len(sources) <= 1:
+            # a thread pool does not pay off for a single source
+            return {source: get_timeshift_pair(source) for source in sources}
+
+        max_workers = min(len(sources), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(sources, executor.map(get_timeshift_pair, sources)))
+
+    def _calculate_stretch_factors(
+        self,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, SyncPairs, Dict[str, SyncPairTimeshift]]:
         """
         Calculate the stretch factor that aligns each reference signal to the reference
         signal of the reference source. It immediately applies these stretch factors
         to a copy of ``self.ref_signals``.
 
-        :return: a copy of self.ref_signals with the stretch factors applied.
+        :return: a copy of self.ref_signals with the stretch factors applied,
+                 the equidistantly sampled reference signals before stretching,
+                 the synchronization pairs detected in them
+                 and the timeshift pairs of each source before stretching
         """
-        ref_signals = self.ref_signals.copy()
+        ref_signals = self.ref_signals
         start_time = ref_signals.index.min()
 
         # Get equidistantly sampled reference signals for the cross correlation to work
-        df_equidistant = get_equidistant_signals(ref_signals, self.sampling_freq)
+        df_equidistant = get_equidistant_signals(
+            ref_signals, self.sampling_freq, index_cache=self._equidistant_indexes
+        )
         sync_pairs = self.extractor.get_segments(df_equidistant)
         helpers.verify_segments(ref_signals.columns, sync_pairs)
 
-        for source in df_equidistant.columns:
-            if source == self.ref_source_name:
-                continue
-
-            timeshifts = Synchronizer._get_timeshift_pair(
-                df_equidistant, self.ref_source_name, source, sync_pairs
-            )
+        all_timeshifts = self._get_timeshift_pairs(df_equidistant, sync_pairs)
+        stretched_signals = {}
+        for source, timeshifts in all_timeshifts.items():
             logger.debug(
                 f"Timedelta between shifts before stretching: "
                 f"{timeshifts['first'] - timeshifts['second']}"
@@ -193,40 +297,81 @@ class Synchronizer:
                 )
             logger.info(f"Stretch factor for {source}: {stretch_factor}")
 
-            # stretch signal and exchange it in dataframe
-            signal_stretched = helpers.stretch_signals(
-                pd.DataFrame(ref_signals[source]).dropna(),
-                stretch_factor,
-                start_time,
-            )
-            ref_signals = (
-                ref_signals.drop(source, axis="columns")
-                .join(signal_stretched, how="outer")
-                .astype(pd.SparseDtype("float"))
+            stretched_signals[source] = helpers.stretch_signals(
+                ref_signals[source].dropna(), stretch_factor, start_time
             )
             self.sources[source]["stretch_factor"] = stretch_factor
 
-        return ref_signals
+        # exchange all stretched signals at once instead of joining them one by one
+        ref_signals = pd.concat(
+            [ref_signals[[self.ref_source_name]], *stretched_signals.values()],
+            axis=1,
+            sort=True,
+        ).astype(pd.SparseDtype(self.dtype))
+
+        return ref_signals, df_equidistant, sync_pairs, all_timeshifts
+
+    def _is_stretch_negligible(self, sync_pairs: SyncPairs) -> bool:
+        """
+        Check whether stretching moves no synchronization point of any source by half a sample or more.
+        Stretching is anchored at the start of the reference signals, so a point moves by its distance
+        to the start times the deviation of the stretch factor from 1.
 
-    def _calculate_timeshifts(self, stretched_ref_signals: pd.DataFrame):
+        :param sync_pairs: the synchronization pairs detected before stretching
+        :return: whether the timeshifts of the unstretched signals are valid for the stretched ones
+        """
+        start_time = self.ref_signals.index.min()
+        max_displacement = 0.5 / self.sampling_freq
+        for source_name, source in self.sources.items():
+            if source_name == self.ref_source_name:
+                continue
+            max_distance = max(
+                abs(sync_point[part] - start_time).total_seconds()
+                for sync_point in sync_pairs[source_name].values()
+                for part in ["start", "end"]
+            )
+            if max_distance * abs(source["stretch_factor"] - 1) >= max_displacement:
+                return False
+        return True
+
+    def _calculate_timeshifts(
+        self,
+        stretched_ref_signals: pd.DataFrame,
+        df_equidistant: pd.DataFrame,
+        sync_pairs: SyncPairs,
+        unstretched_timeshifts: Dict[str, SyncPairTimeshift],
+    ):
         """
         Calculate the shift necessary to align the stretched reference signals to the not-stretched reference sensor.
 
         :param stretched_ref_signals: a copy of self.ref_signals that has been stretched to align the duration between
                the synchronization points to the duration between them in the reference sensor
+        :param df_equidistant: the equidistantly sampled reference signals before stretching
+        :param sync_pairs: the synchronization pairs detected in ``df_equidistant``
+        :param unstretched_timeshifts: the timeshift pairs of each source calculated on ``df_equidistant``
         """
-        # Resample again with stretched signal
-        df_equi = get_equidistant_signals(stretched_ref_signals, self.sampling_freq)
-        segments = self.extractor.get_segments(df_equi)
-        helpers.verify_segments(stretched_ref_signals.columns, segments)
-
-        for source in df_equi.columns:
-            if source == self.ref_source_name:
-                continue
-
-            timeshifts = Synchronizer._get_timeshift_pair(
-                df_equi, self.ref_source_name, source, segments
+        if self._is_stretch_negligible(sync_pairs):
+            # stretching moves no synchronization point by half a sample, no need to resample and search again
+            logger.debug(
+                "Stretching moves no synchronization point noticeably, "
+                "reusing the timeshifts of the unstretched signals."
             )
+            all_timeshifts = unstretched_timeshifts
+        else:
+            # Resample again with stretched signal, the reference signal itself is never stretched
+            df_equi = get_equidistant_signals(
+                stretched_ref_signals,
+                self.sampling_freq,
+                resampled_columns={
+                    self.ref_source_name: df_equidistant[self.ref_source_name].dropna()
+                },
+                index_cache=self._equidistant_indexes,
+            )
+            segments = self.extractor.get_segments(df_equi)
+            helpers.verify_segments(stretched_ref_signals.columns, segments)
+            all_timeshifts = self._get_timeshift_pairs(df_equi, segments)
+
+        for source, timeshifts in all_timeshifts.items():
             timedelta = timeshifts["first"] - timeshifts["second"]
             if timedelta > pd.Timedelta(0):
                 logger.warning(
@@ -243,14 +388,22 @@ class Synchronizer:
         This function calculates the synchronization parameters to sync all signals to the reference signal.
         It stores the result in ``self.sources``, in the keys ``timeshift`` and ``stretch_factor``.
         """
+        self._synced_data = None
         self.sources[self.ref_source_name]["timeshift"] = None
         self.sources[self.ref_source_name]["stretch_factor"] = 1
 
         # Firstly, determine stretch factor and get stretched reference signals
-        stretched_ref_signals = self._calculate_stretch_factors()
+        (
+            stretched_ref_signals,
+            df_equidistant,
+            sync_pairs,
+            unstretched_timeshifts,
+        ) = self._calculate_stretch_factors()
 
         # Secondly, get timeshift for the stretched signals
-        self._calculate_timeshifts(stretched_ref_signals)
+        self._calculate_timeshifts(
+            stretched_ref_signals, df_equidistant, sync_pairs, unstretched_timeshifts
+        )
 
     def get_sync_params(self, recalculate: bool = False):
         """
@@ -272,21 +425,32 @@ class Synchronizer:
     def get_synced_data(self, recalculate: bool = False) -> Dict[str, pd.DataFrame]:
         """
         Synchronize the input data.
+        The result is cached, so repeated calls (e.g., when saving) do not stretch and shift the data again.
+        Synchronizing only replaces the index, so the returned DataFrames share their data with the input DataFrames.
+        Sources that do not need to be synchronized, e.g., the reference source, are returned as they are.
 
         :param recalculate: force recalculating the synchronization parameters
         :return: a dictionary of the shifted and stretched source signals
         """
         self.get_sync_params(recalculate)
+        if self._synced_data is None:
+            self._synced_data = self._sync_data()
+        return dict(self._synced_data)
+
+    def _sync_data(self) -> Dict[str, pd.DataFrame]:
+        """Apply the calculated stretch factors and timeshifts to the data of each source"""
         synced_data = {}
         start_time = self.ref_signals.index.min()
         for source_name, source in self.sources.items():
-            data = source["data"].copy()
+            data = source["data"]
             stretch_factor, timeshift = source["stretch_factor"], source["timeshift"]
 
             if stretch_factor != 1:
                 data = helpers.stretch_signals(data, stretch_factor, start_time)
             if timeshift is not None:
-                data = data.shift(1, freq=timeshift)
+                shifted_index = data.index + timeshift
+                data = data.copy(deep=False)
+                data.index = shifted_index
             synced_data[source_name] = data
         return synced_data
 
@@ -311,11 +475,149 @@ class Synchronizer:
 
         return {**synced_data, "SYNC": sync_params}
 
+    @staticmethod
+    def _save_table(
+        table: pd.DataFrame, target_dir: str, table_name: str, file_format: str
+    ):
+        """Write a single export table to ``target_dir`` in the given file format"""
+        file_path = os.path.join(target_dir, f"{table_name}.{file_format}")
+        if file_format == "parquet":
+            table.to_parquet(file_path, engine="pyarrow", compression="zstd")
+        elif file_format == "feather":
+            import pyarrow as pa
+            import pyarrow.feather as feather
+
+            # DataFrame.to_feather cannot store the index, so convert it ourselves
+            feather.write_feather(
+                pa.Table.from_pandas(table, preserve_index=True),
+                file_path,
+                compression="uncompressed",
+            )
+        else:
+            table.to_csv(file_path)
+
+    @staticmethod
+    def _open_arrow_writer(file_path: str, schema, file_format: str):
+        """Open a writer that appends Arrow tables with the given schema to a parquet or feather file"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if file_format == "parquet":
+            return pq.ParquetWriter(file_path, schema, compression="zstd")
+        # feather (version 2) files are Arrow IPC files
+        return pa.ipc.new_file(
+            file_path, schema, options=pa.ipc.IpcWriteOptions(compression=None)
+        )
+
+    @staticmethod
+    def _get_total_table_schema(
+        first_chunk: pd.DataFrame,
+        synced_data: Dict[str, pd.DataFrame],
+        dtypes: Dict[str, pd.Series],
+    ):
+        """
+        Get the Arrow schema of the total table. Arrow infers the type of object columns from their values,
+        so a column without any value in the first chunk would be typed ``null`` and reject all later chunks.
+        These columns are typed from the first valid value of each column of the source instead.
+        """
+        import pyarrow as pa
+
+        schema = pa.Schema.from_pandas(first_chunk, preserve_index=True)
+        for source_name, data in synced_data.items():
+            prefixed_columns = [f"{source_name}_{column}" for column in data.columns]
+            if len(data) == 0 or all(
+                schema.field(column).type != pa.null() for column in prefixed_columns
+            ):
+                continue
+
+            first_valid = np.unique(data.notna().to_numpy().argmax(axis=0))
+            sample = (
+                data.iloc[first_valid]
+                .astype(dtypes[source_name], copy=False)
+                .add_prefix(f"{source_name}_")
+            )
+            sample_schema = pa.Schema.from_pandas(sample, preserve_index=False)
+            for column in prefixed_columns:
+                if schema.field(column).type == pa.null():
+                    schema = schema.set(
+                        schema.get_field_index(column), sample_schema.field(column)
+                    )
+        return schema
+
+    def _save_total_table(
+        self,
+        synced_data: Dict[str, pd.DataFrame],
+        target_dir: str,
+        file_format: str,
+    ):
+        """
+        Save an outer join over all synchronized dataframes as ``TOTAL``.
+        The joined table is built and written in slices of ``total_table_chunk_size`` rows of the common
+        timeline, so the complete table never has to be held in memory at once.
+
+        :param synced_data: the synchronized dataframe of each source
+        :param target_dir: target directory for the export file
+        :param file_format: ``csv``, ``parquet`` or ``feather``
+        """
+        union_index = functools.reduce(
+            lambda left, right: left.union(right),
+            (data.index for data in synced_data.values()),
+        )
+        # sources that do not cover the whole timeline are upcast just like in a single outer join
+        dtypes = {
+            source_name: data.dtypes
+            if len(data.index) == len(union_index)
+            else data.iloc[:0].reindex(union_index[:1]).dtypes
+            for source_name, data in synced_data.items()
+        }
+
+        file_path = os.path.join(target_dir, f"TOTAL.{file_format}")
+        writer, schema = None, None
+        try:
+            for chunk_start in range(0, len(union_index), self.total_table_chunk_size):
+                chunk_index = union_index[
+                    chunk_start : chunk_start + self.total_table_chunk_size
+                ]
+                chunk = pd.concat(
+                    [
+                        data.reindex(chunk_index)
+                        .astype(dtypes[source_name], copy=False)
+                        .add_prefix(f"{source_name}_")
+                        for source_name, data in synced_data.items()
+                    ],
+                    axis="columns",
+                )
+
+                if file_format in ["parquet", "feather"]:
+                    import pyarrow as pa
+
+                    if writer is None:
+                        schema = Synchronizer._get_total_table_schema(
+                            chunk, synced_data, dtypes
+                        )
+                        writer = Synchronizer._open_arrow_writer(
+                            file_path, schema, file_format
+                        )
+                    table = pa.Table.from_pandas(
+                        chunk, schema=schema, preserve_index=True
+                    )
+                    writer.write_table(table)
+                else:
+                    chunk.to_csv(
+                        file_path,
+                        mode="w" if chunk_start == 0 else "a",
+                        header=chunk_start == 0,
+                    )
+        finally:
+            if writer is not None:
+                writer.close()
+
     def save_data(
         self,
         target_dir: str,
         tables: Optional[ResultTableSpec] = None,
         save_total_table: bool = True,
+        file_format: str = "csv",
     ):
         """
         Export synchronized data.
@@ -328,7 +630,25 @@ class Synchronizer:
         :param target_dir: target directory for the export files
         :param tables: ResultTableSpec to specify the export format, or None
         :param save_total_table: exports an outer join over all synchronized dataframes
+        :param file_format: ``csv``, ``parquet`` or ``feather``. Parquet files are written with ``zstd`` compression,
+               which is considerably faster and smaller for large tables. Feather files are written uncompressed,
+               which is the fastest option to write and read back. Both require ``pyarrow``, e.g., via ``jointly[pyarrow]``.
+               ``SYNC.csv`` is always saved as CSV.
         """
+        if file_format not in ["csv", "parquet", "feather"]:
+            raise ValueError(
+                f"Unknown file format {file_format}, use either csv, parquet or feather"
+            )
+        if file_format != "csv":
+            # check before anything is written, to not leave a partial export behind
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    f"Saving {file_format} files requires pyarrow, "
+                    f"install it with: pip install jointly[pyarrow]"
+                )
+
         if tables is not None and "SYNC" in tables.keys():
             raise ValueError(
                 "SYNC must not be one of the table names. "
@@ -358,39 +678,33 @@ class Synchronizer:
                     )
                     continue
 
-                table_df = pd.DataFrame()
-
+                source_dfs = []
                 for source_name, source_columns in table_spec.items():
-                    # create dataframe for each source
-                    source_df = pd.DataFrame()
                     for column in source_columns:
-                        try:
-                            data = synced_data[source_name][column]
-                        except KeyError:
+                        if (
+                            source_name not in synced_data
+                            or column not in synced_data[source_name].columns
+                        ):
                             raise ValueError(
                                 f"Requested non-existing {source_name}->{column}"
                             )
-                        # join selected signals to device dataframe
-                        source_df = source_df.join(data, how="outer")
-                    if not source_df.empty:
-                        # add device signals to general dataframe
-                        source_df = source_df.rename(
-                            lambda col_name: f"{source_name}_{col_name}",
-                            axis="columns",
-                        )
-                        table_df = table_df.join(source_df, how="outer")
-
+                    if len(source_columns) > 0:
+                        # select all requested signals of the source at once
+                        source_df = synced_data[source_name][source_columns]
+                        source_df.columns = [
+                            f"{source_name}_{column}" for column in source_columns
+                        ]
+                        source_dfs.append(source_df)
+
+                # join all device signals into the general dataframe at once
+                table_df = (
+                    pd.concat(source_dfs, axis="columns", join="outer", sort=True)
+                    if len(source_dfs) > 0
+                    else pd.DataFrame()
+                )
                 table_df.dropna(axis="index", how="all", inplace=True)
-                table_df.to_csv(os.path.join(target_dir, f"{table_name}.csv"))
+                Synchronizer._save_table(table_df, target_dir, table_name, file_format)
 
         # Save table with total data
         if save_total_table:
-            total_table = pd.DataFrame()
-
-            for source_name, data in synced_data.items():
-                source_df = data.rename(
-                    lambda col_name: f"{source_name}_{col_name}",
-                    axis="columns",
-                )
-                total_table = total_table.join(source_df, how="outer")
-            total_table.to_csv(os.path.join(target_dir, "TOTAL.csv"))
+            self._save_total_table(synced_data, target_dir, file_format)
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from tests.parquet_reader import get_parquet_test_data
+
+
+@pytest.fixture(scope="session")
+def faros_internal() -> pd.DataFrame:
+    """Data of device 667 of the faros-internal recording, shared by read-only tests"""
+    return get_parquet_test_data("faros-internal.parquet", 667)
+
+
+@pytest.fixture(scope="session")
+def faros_internal_ref() -> pd.DataFrame:
+    """Data of device 666 of the faros-internal recording, shared by read-only tests"""
+    return get_parquet_test_data("faros-internal.parquet", 666)
+
+
+@pytest.fixture(scope="session")
+def base_data() -> pd.DataFrame:
+    """The test-data recording, shared by read-only tests"""
+    return get_parquet_test_data("test-data.parquet")
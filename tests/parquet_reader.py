@@ -1,32 +1,59 @@
+import functools
 import os.path
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 
 def read_parquet_sensor_data(
-    file: str, device_id: Optional[int] = None
+    file: str, device_id: Optional[int] = None, types: Optional[Tuple[str]] = None
 ) -> pd.DataFrame:
-    """Read a long-format parquet file into a dataframe"""
-    df = pd.read_parquet(file)
+    """Read a long-format parquet file into a dataframe, optionally only the given device and sensor data types"""
+    columns = ["timestamp", "type", "value"]
+    if device_id is not None:
+        columns.append("deviceId")
 
-    df_components = [
-        df["timestamp"].explode(ignore_index=True),
-        df["type"].explode(ignore_index=True),
-        df["value"].explode(ignore_index=True),
-    ]
+    # each row holds lists of values, flatten them once in arrow instead of exploding them in pandas
+    table = pq.read_table(file, columns=columns, use_threads=True, memory_map=True)
+    table = pa.table({col: pc.list_flatten(table[col]) for col in columns})
 
-    if device_id is None:
-        return pd.concat(df_components, axis="columns")
+    if device_id is not None:
+        table = table.filter(pc.equal(table["deviceId"], device_id))
+        table = table.drop(["deviceId"])
+    if types is not None:
+        table = table.filter(pc.is_in(table["type"], value_set=pa.array(types)))
+    return table.to_pandas(use_threads=True)
+
+
+def get_parquet_test_data(
+    file_name: str,
+    device_id: Optional[int] = None,
+    columns: Optional[Iterable[str]] = None,
+):
+    """
+    Pivot a long-format dataframe into groups of data points with the same sensor data type group.
+    If ``columns`` are given, only these sensor data types are read.
+    """
+    if os.path.isfile(f"../test-data/{file_name}"):
+        file = f"../test-data/{file_name}"
+    elif os.path.isfile(f"./test-data/{file_name}"):
+        file = f"./test-data/{file_name}"
     else:
-        device_col = df["deviceId"].explode(ignore_index=True)
-        df = pd.concat([*df_components, device_col], axis="columns")
-        df = df[df["deviceId"] == device_id]
-        return df.drop("deviceId", axis="columns")
+        raise FileNotFoundError(f"Couldn't find test file `{file_name}`")
+
+    # tests may modify the data, so never hand out the cached instance
+    types = None if columns is None else tuple(columns)
+    return _read_parquet_test_data(os.path.abspath(file), device_id, types).copy()
 
 
-def get_parquet_test_data(file_name: str, device_id: Optional[int] = None):
-    """Pivot a long-format dataframe into groups of data points with the same sensor data type group"""
+@functools.lru_cache(maxsize=None)
+def _read_parquet_test_data(
+    file: str, device_id: Optional[int], types: Optional[Tuple[str]]
+) -> pd.DataFrame:
+    """Read and pivot the test data once per file and device, the same files are used by many tests"""
     sensor_data_type_group_map = {
         "ACCELERATION_X": "ACCELERATION",
         "ACCELERATION_Y": "ACCELERATION",
@@ -46,19 +73,24 @@ def get_parquet_test_data(file_name: str, device_id: Optional[int] = None):
         "GRAVITY_Z": "GRAVITY",
         "LIGHT": "LIGHT",
     }
-    if os.path.isfile(f"../test-data/{file_name}"):
-        file = f"../test-data/{file_name}"
-    elif os.path.isfile(f"./test-data/{file_name}"):
-        file = f"./test-data/{file_name}"
-    else:
-        raise FileNotFoundError(f"Couldn't find test file `{file_name}`")
-
-    data: pd.DataFrame = read_parquet_sensor_data(file, device_id)
-    data["typeGroup"] = data["type"].map(sensor_data_type_group_map.get)
+    data: pd.DataFrame = read_parquet_sensor_data(file, device_id, types)
+    # pivot on the integer codes of the types, which is much cheaper than on the type strings
+    types = data["type"].astype("category")
     data = (
-        data.reset_index(drop=True)
-        .pivot(index=["timestamp", "typeGroup"], columns=["type"], values="value")
+        data["value"]
+        .set_axis(
+            pd.MultiIndex.from_arrays(
+                [
+                    data["timestamp"],
+                    types.map(sensor_data_type_group_map),
+                    types.cat.codes,
+                ],
+                names=["timestamp", "typeGroup", "type"],
+            )
+        )
+        .unstack("type")
         .droplevel("typeGroup")
     )
+    data.columns = types.cat.categories[data.columns].rename("type")
     data.index = pd.to_datetime(data.index, unit="ns", utc=True)
     return data
@@ -1,4 +1,4 @@
-import copy
+import datetime
 
 import numpy as np
 import pandas as pd
@@ -16,8 +16,7 @@ from jointly.helpers import (
     stretch_signals,
     get_equidistant_signals,
 )
-from jointly.types import SynchronizationPair
-from tests.parquet_reader import get_parquet_test_data
+from jointly.types import SynchronizationPair, SyncPairs
 
 
 def test_calculate_magnitude():
@@ -33,6 +32,10 @@ def test_calculate_magnitude():
         magnitude["testname"]
     ), "Should be possible to set+rename result to old dataframe"
 
+    df_nan = pd.DataFrame({"x": [3, np.nan], "y": [np.nan, np.nan], "z": [4, 2]})
+    magnitude_nan = calculate_magnitude(df_nan, ["x", "y", "z"])
+    assert magnitude_nan["Magnitude"].tolist() == [5, 2], "NaN should be treated as 0"
+
 
 def test_normalize():
     assert np.array_equal(normalize([1, 2, 3]), [-1, 0, 1]), "should be normalized"
@@ -46,24 +49,54 @@ def test_normalize():
         normalize([0, 0])
 
 
-def test_get_equidistant_signals():
-    test_data = get_parquet_test_data("faros-internal.parquet", 667)
+@pytest.mark.parametrize("frequency", [1, 500, 1_000])
+def test_get_equidistant_signals(faros_internal, frequency):
+    result = get_equidistant_signals(faros_internal, frequency=frequency)
+    # all columns share the index, so checking its spacing once covers all of them
+    assert (
+        np.diff(result.index.asi8) == int(1e9 / frequency)
+    ).all(), f"index should be equidistant at {frequency} Hz"
 
-    result = get_equidistant_signals(test_data, frequency=1_000)
-    for col in result.columns:
-        assert infer_freq(result[col]) == 1000, f"{col} should have 1000 Hz"
 
-    result = get_equidistant_signals(test_data, frequency=500)
-    for col in result.columns:
-        assert infer_freq(result[col]) == 500, f"{col} should have 500 Hz"
+def test_get_equidistant_signals_timezones(faros_internal):
+    index_cache = {}
+    result_utc = get_equidistant_signals(faros_internal, 100, index_cache=index_cache)
+    result_berlin = get_equidistant_signals(
+        faros_internal.tz_convert("Europe/Berlin"), 100, index_cache=index_cache
+    )
+    assert str(result_utc.index.tz) == "UTC", "should keep the timezone"
+    assert (
+        str(result_berlin.index.tz) == "Europe/Berlin"
+    ), "should not reuse an index of another timezone"
+    assert np.array_equal(
+        result_berlin.index.asi8, result_utc.index.asi8
+    ), "should be the same instants"
+
+    result_berlin = get_equidistant_signals(
+        faros_internal.tz_convert("Europe/Berlin"), 100
+    )
+    assert str(result_berlin.index.tz) == "Europe/Berlin", "should keep the timezone"
 
-    result = get_equidistant_signals(test_data, frequency=1)
-    for col in result.columns:
-        assert infer_freq(result[col]) == 1, f"{col} should have 1 Hz"
 
+def test_get_equidistant_signals_nearest(faros_internal):
+    test_data = faros_internal
 
-def test_get_max_ref_frequency():
-    test_data = get_parquet_test_data("faros-internal.parquet", 667)
+    for frequency in [1_000, 333, 1]:
+        result = get_equidistant_signals(test_data, frequency=frequency)
+        freq = "{}N".format(int(1e9 / frequency))
+        expected = pd.DataFrame(
+            {
+                col: test_data[col].dropna().resample(freq).nearest()
+                for col in test_data.columns
+            }
+        )
+        assert np.array_equal(
+            result.to_numpy(), expected.to_numpy(), equal_nan=True
+        ), f"should choose the same samples as pandas at {frequency} Hz"
+
+
+def test_get_max_ref_frequency(faros_internal):
+    test_data = faros_internal
 
     assert get_max_ref_frequency(test_data) == 500, "max(all) should be 500 Hz"
     assert (
@@ -73,6 +106,12 @@ def test_get_max_ref_frequency():
         get_max_ref_frequency(test_data["ACCELERATION_Y"].to_frame()) == 100
     ), "max(acc) should be 100 Hz"
 
+    single_value = test_data[["ACCELERATION_X"]].assign(SINGLE=np.nan)
+    single_value.iloc[0, 1] = 1
+    assert (
+        get_max_ref_frequency(single_value) == 100
+    ), "should ignore columns with a single value"
+
     with pytest.raises(ValueError):
         get_max_ref_frequency(test_data["ACCELERATION_X"])
 
@@ -80,14 +119,19 @@ def test_get_max_ref_frequency():
         get_max_ref_frequency(pd.DataFrame())
 
 
-def test_infer_freq():
-    test_data = get_parquet_test_data("faros-internal.parquet", 667)
+def test_infer_freq(faros_internal):
+    test_data = faros_internal
 
     assert infer_freq(test_data["ECG"]) == 500, "ECG should be 500 Hz"
     assert infer_freq(test_data["ACCELERATION_X"]) == 100, "Acc. should be 100 Hz"
     assert infer_freq(test_data["ACCELERATION_Y"]) == 100, "Acc. should be 100 Hz"
     assert infer_freq(test_data["ACCELERATION_Z"]) == 100, "Acc. should be 100 Hz"
 
+    single_value = test_data["ECG"].iloc[:1]
+    assert np.isnan(infer_freq(single_value)), "should be NaN for a single value"
+    duplicates = pd.Series([1, 2], index=[test_data.index[0]] * 2)
+    assert infer_freq(duplicates) == np.inf, "should be inf without time distance"
+
 
 def test_stretch_signals():
     test_idx = pd.date_range(start="1/1/2018", periods=8)
@@ -100,10 +144,31 @@ def test_stretch_signals():
 
     result = stretch_signals(test_df, factor=2, start_time=test_idx.min())
     assert result is not test_df, "must be a copy"
+    assert test_df.index.max() == test_idx.max(), "must not modify the input"
     assert result.index.max() == pd.to_datetime(
         "1/15/2018"
     ), "must have double the distance equal"
 
+    with pytest.raises(ValueError):
+        stretch_signals(test_df, factor=0, start_time=test_idx.min())
+
+    for start_time in [datetime.datetime(2018, 1, 1), np.datetime64("2018-01-01")]:
+        result = stretch_signals(test_df, factor=2, start_time=start_time)
+        assert result.index.max() == pd.to_datetime(
+            "1/15/2018"
+        ), "should accept other datetime types"
+
+    with pytest.raises(TypeError):
+        stretch_signals(test_df.tz_localize("UTC"), 2, start_time=test_idx.min())
+
+    # across a DST change, durations have to be stretched in absolute time
+    tz_idx = pd.date_range(start="3/25/2018", periods=3, tz="Europe/Berlin")
+    result = stretch_signals(test_df[:3].set_axis(tz_idx), 0.5, tz_idx.min())
+    assert result.index.tz == tz_idx.tz, "must keep the timezone"
+    assert result.index[-1] - result.index[0] == pd.Timedelta(
+        hours=23.5
+    ), "must halve the absolute duration"
+
 
 def test_get_stretch_factor():
     def _ts(seconds: int) -> pd.Timestamp:
@@ -128,6 +193,14 @@ def test_get_stretch_factor():
     ), "should halve the speed if distance doubles"
 
 
+def _clone(segments: SyncPairs) -> SyncPairs:
+    """Copy the nested dicts of synchronization pairs, much cheaper than a deepcopy"""
+    return {
+        signal: {segment: dict(points) for segment, points in pair.items()}
+        for signal, pair in segments.items()
+    }
+
+
 def test_verify_segments():
     """delete all parts of a proper SyncPairs instance and check if the verification alg throws"""
     good_segments = {
@@ -150,19 +223,19 @@ def test_verify_segments():
     for signal_name, signal_dict in good_segments.items():
         for segment_name, segment_dict in signal_dict.items():
             for position_name in segment_dict:
-                copied = copy.deepcopy(good_segments)
+                copied = _clone(good_segments)
                 del copied[signal_name][segment_name][position_name]
 
                 with pytest.raises(ShakeMissingException):
                     # noinspection PyTypeChecker
                     verify_segments(columns, copied)
-            copied = copy.deepcopy(good_segments)
+            copied = _clone(good_segments)
             del copied[signal_name][segment_name]
 
             with pytest.raises(ShakeMissingException):
                 # noinspection PyTypeChecker
                 verify_segments(columns, copied)
-        copied = copy.deepcopy(good_segments)
+        copied = _clone(good_segments)
         del copied[signal_name]
 
         with pytest.raises(ShakeMissingException):
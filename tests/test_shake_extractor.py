@@ -1,7 +1,10 @@
+import numpy as np
 import pandas as pd
 import pytest
+import scipy.signal
 
 from jointly import ShakeExtractor, Synchronizer, BadWindowException
+from jointly.shake_extractor import _find_peaks_above
 from tests.parquet_reader import get_parquet_test_data
 
 
@@ -44,3 +47,14 @@ def test_window_length_error():
 
     with pytest.raises(BadWindowException):
         Synchronizer(sources, reference_signal, extractor).get_sync_params()
+
+
+def test_find_peaks_above():
+    values = np.array(
+        [0.9, 0.1, 0.6, 0.2, 0.7, 0.7, 0.3, np.nan, 0.8, 0.1, 0.5, 0.9, 0.9, 0.95]
+    )
+    for threshold in [0.05, 0.5, 0.7, 0.75, 1]:
+        expected, _ = scipy.signal.find_peaks(values, height=threshold)
+        assert np.array_equal(
+            _find_peaks_above(values, threshold), expected
+        ), f"should find the same peaks as scipy for threshold {threshold}"
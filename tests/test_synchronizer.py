@@ -1,23 +1,26 @@
 """Happy path tests for the synchronizer and shake extractor"""
+import hashlib
 import os.path
+import pickle
+import sys
 import tempfile
 
+import numpy as np
 import pandas as pd
 import pytest
+from pyarrow import csv as pacsv, feather
 
 import jointly
 from jointly import ShakeExtractor
 from jointly.helpers import stretch_signals
-from tests.parquet_reader import get_parquet_test_data
 
 
-def test_happy_path_faros_internal():
-    ref_data = get_parquet_test_data("faros-internal.parquet", 666)
-    target_data = get_parquet_test_data("faros-internal.parquet", 667)
-    reference_signal, target_signal = "Internal", "Faros"
+@pytest.fixture(scope="module")
+def faros_sync(faros_internal_ref, faros_internal) -> jointly.Synchronizer:
+    """Synchronizer for the faros-internal recording, shared by the tests that only read its results"""
     sources = {
-        reference_signal: {"data": ref_data, "ref_column": "ACCELERATION_Z"},
-        target_signal: {"data": target_data, "ref_column": "ACCELERATION_Z"},
+        "Internal": {"data": faros_internal_ref, "ref_column": "ACCELERATION_Z"},
+        "Faros": {"data": faros_internal, "ref_column": "ACCELERATION_Z"},
     }
     extractor = ShakeExtractor()
     extractor.start_window_length = pd.Timedelta(seconds=17)
@@ -25,7 +28,12 @@ def test_happy_path_faros_internal():
     extractor.min_length = 3
     extractor.threshold = 0.19
 
-    synchronizer = jointly.Synchronizer(sources, reference_signal, extractor)
+    return jointly.Synchronizer(sources, "Internal", extractor)
+
+
+def test_happy_path_faros_internal(faros_sync):
+    reference_signal, target_signal = "Internal", "Faros"
+    synchronizer = faros_sync
     sync_result = synchronizer.get_sync_params()
 
     assert (
@@ -43,8 +51,7 @@ def test_happy_path_faros_internal():
     ), "Should have stretching factor of 1 for equal signal"
 
 
-def test_happy_path_equal_data():
-    base_data = get_parquet_test_data("test-data.parquet")
+def test_happy_path_equal_data(base_data):
     reference_signal, target_signal = "A", "B"
     sources = {
         reference_signal: {"data": base_data.copy(), "ref_column": "ACCELERATION_Z"},
@@ -74,8 +81,7 @@ def test_happy_path_equal_data():
     ), "Should have stretching factor of 1 for equal signal"
 
 
-def test_happy_path_shifted_data():
-    base_data = get_parquet_test_data("test-data.parquet")
+def test_happy_path_shifted_data(base_data):
     reference_signal, target_signal = "A", "B"
     target_df = base_data.shift(-22, freq="100ms")
 
@@ -107,8 +113,7 @@ def test_happy_path_shifted_data():
     ), "Should have stretching factor of 1 for equal signal"
 
 
-def test_happy_path_shifted_stretched_data():
-    base_data = get_parquet_test_data("test-data.parquet")
+def test_happy_path_shifted_stretched_data(base_data):
     reference_signal, target_signal = "A", "B"
     target_df = base_data.shift(-22, freq="100ms")
     target_df = stretch_signals(target_df, 1.1, target_df.index.min())
@@ -141,21 +146,43 @@ def test_happy_path_shifted_stretched_data():
     ), "Should have stretching factor of 1 for equal signal"
 
 
-def test_happy_path_save_pickles():
-    ref_data = get_parquet_test_data("faros-internal.parquet", 666)
-    target_data = get_parquet_test_data("faros-internal.parquet", 667)
-    reference_signal, target_signal = "Internal", "Faros"
+def test_slightly_stretched_data_long_lead_in():
+    # a stretch factor close to 1 still moves a shake long after the start by several samples
+    sampling_freq, lead_in, second_shake, duration = 100, 3000, 4200, 4300
+    seconds = np.arange(0, duration, 1 / sampling_freq)
+    signal = np.random.default_rng(0).normal(0, 0.05, len(seconds))
+    for shake_start in [lead_in, second_shake]:
+        shake = (seconds >= shake_start) & (seconds < shake_start + 4)
+        signal[shake] += 5 * np.sin(2 * np.pi * 3 * (seconds[shake] - shake_start))
+    index = pd.Timestamp("2021-01-01") + pd.to_timedelta(seconds, unit="s")
+    reference_df = pd.DataFrame({"ACCELERATION_Z": signal}, index=index)
+    target_df = stretch_signals(reference_df.copy(), 1.000008, index.min())
+    target_df = target_df.shift(1, freq="1500ms")
+
+    reference_signal, target_signal = "A", "B"
     sources = {
-        reference_signal: {"data": ref_data, "ref_column": "ACCELERATION_Z"},
-        target_signal: {"data": target_data, "ref_column": "ACCELERATION_Z"},
+        reference_signal: {"data": reference_df, "ref_column": "ACCELERATION_Z"},
+        target_signal: {"data": target_df, "ref_column": "ACCELERATION_Z"},
     }
     extractor = ShakeExtractor()
-    extractor.start_window_length = pd.Timedelta(seconds=17)
-    extractor.end_window_length = pd.Timedelta(seconds=10)
+    extractor.start_window_length = pd.Timedelta(seconds=lead_in + 100)
+    extractor.end_window_length = pd.Timedelta(seconds=duration - second_shake + 100)
     extractor.min_length = 3
-    extractor.threshold = 0.19
+    extractor.threshold = 0.5
 
     synchronizer = jointly.Synchronizer(sources, reference_signal, extractor)
+    sync_result = synchronizer.get_sync_params()
+
+    assert sync_result[target_signal]["stretch_factor"] == pytest.approx(
+        1 / 1.000008, abs=1e-6
+    ), "Should detect the small stretch factor"
+    assert sync_result[target_signal]["timeshift"] == pd.Timedelta(
+        seconds=-1.5
+    ), "Should calculate the timeshift on the stretched signals"
+
+
+def test_happy_path_save_pickles(faros_sync):
+    synchronizer = faros_sync
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         synchronizer.save_pickles(tmp_dir)
@@ -164,24 +191,15 @@ def test_happy_path_save_pickles():
         for signal, signal_df in synced_data.items():
             pickle_path = os.path.join(tmp_dir, f"{signal.upper()}.PICKLE")
             assert os.path.isfile(pickle_path)
-            assert pd.read_pickle(pickle_path).equals(signal_df)
+            # comparing digests of the pickled bytes avoids unpickling every frame
+            with open(pickle_path, "rb") as pickle_file:
+                saved_digest = hashlib.sha256(pickle_file.read()).digest()
+            expected_pickle = pickle.dumps(signal_df, protocol=pickle.HIGHEST_PROTOCOL)
+            assert saved_digest == hashlib.sha256(expected_pickle).digest()
 
 
-def test_bad_table_spec_save_tables():
-    ref_data = get_parquet_test_data("faros-internal.parquet", 666)
-    target_data = get_parquet_test_data("faros-internal.parquet", 667)
-    reference_signal, target_signal = "Internal", "Faros"
-    sources = {
-        reference_signal: {"data": ref_data, "ref_column": "ACCELERATION_Z"},
-        target_signal: {"data": target_data, "ref_column": "ACCELERATION_Z"},
-    }
-    extractor = ShakeExtractor()
-    extractor.start_window_length = pd.Timedelta(seconds=17)
-    extractor.end_window_length = pd.Timedelta(seconds=10)
-    extractor.min_length = 3
-    extractor.threshold = 0.19
-
-    synchronizer = jointly.Synchronizer(sources, reference_signal, extractor)
+def test_bad_table_spec_save_tables(faros_sync):
+    synchronizer = faros_sync
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         with pytest.raises(ValueError):
@@ -196,21 +214,8 @@ def test_bad_table_spec_save_tables():
             )
 
 
-def test_happy_path_save_tables():
-    ref_data = get_parquet_test_data("faros-internal.parquet", 666)
-    target_data = get_parquet_test_data("faros-internal.parquet", 667)
-    reference_signal, target_signal = "Internal", "Faros"
-    sources = {
-        reference_signal: {"data": ref_data, "ref_column": "ACCELERATION_Z"},
-        target_signal: {"data": target_data, "ref_column": "ACCELERATION_Z"},
-    }
-    extractor = ShakeExtractor()
-    extractor.start_window_length = pd.Timedelta(seconds=17)
-    extractor.end_window_length = pd.Timedelta(seconds=10)
-    extractor.min_length = 3
-    extractor.threshold = 0.19
-
-    synchronizer = jointly.Synchronizer(sources, reference_signal, extractor)
+def test_happy_path_save_tables(faros_sync):
+    synchronizer = faros_sync
 
     acc_columns = ["ACCELERATION_X", "ACCELERATION_Y", "ACCELERATION_Z"]
     with tempfile.TemporaryDirectory() as tmp_dir:
@@ -218,25 +223,35 @@ def test_happy_path_save_tables():
             "ACC": {"Faros": acc_columns, "Internal": acc_columns},
             "ECG": {"Faros": ["ECG"]},
         }
-        synchronizer.save_data(tmp_dir, tables=tables, save_total_table=False)
+        synchronizer.save_data(
+            tmp_dir, tables=tables, save_total_table=False, file_format="feather"
+        )
         for file in ["ACC", "ECG", "SYNC"]:
-            file_path = os.path.join(tmp_dir, f"{file}.csv")
+            file_format = "csv" if file == "SYNC" else "feather"
+            file_path = os.path.join(tmp_dir, f"{file}.{file_format}")
 
             assert os.path.isfile(file_path), f"{file_path} should exist"
-            df = pd.read_csv(file_path)
 
             if file == "ACC":
-                assert len(df) == 4115, "Should have saved all acc values"
-                assert "timestamp" in df.columns, "Should have saved timestamp column"
+                table = feather.read_table(file_path)
+                assert table.num_rows == 4115, "Should have saved all acc values"
+                assert (
+                    "timestamp" in table.column_names
+                ), "Should have saved timestamp column"
                 for col in acc_columns:
                     for device in tables["ACC"]:
                         assert (
-                            f"{device}_{col}" in df.columns
+                            f"{device}_{col}" in table.column_names
                         ), f"Should have saved {device}_{col}"
             elif file == "ECG":
-                assert len(df) == 15100, "Should have saved all ecg values"
-                assert "timestamp" in df.columns, "Should have saved timestamp column"
+                table = feather.read_table(file_path)
+                assert table.num_rows == 15100, "Should have saved all ecg values"
+                assert (
+                    "timestamp" in table.column_names
+                ), "Should have saved timestamp column"
             elif file == "SYNC":
+                # pandas names the unnamed index column, so read the small sync table with it
+                df = pd.read_csv(file_path)
                 for source in ["Faros", "Internal"]:
                     assert (
                         source in df.columns
@@ -244,26 +259,171 @@ def test_happy_path_save_tables():
                 assert "Unnamed: 0" in df.columns, "Should have saved index column"
 
 
-def test_happy_path_save_total_table():
-    ref_data = get_parquet_test_data("faros-internal.parquet", 666)
-    target_data = get_parquet_test_data("faros-internal.parquet", 667)
-    reference_signal, target_signal = "Internal", "Faros"
+def test_happy_path_save_total_table(faros_sync, monkeypatch):
+    synchronizer = faros_sync
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # write the total table in multiple chunks
+        monkeypatch.setattr(synchronizer, "total_table_chunk_size", 1000)
+        synchronizer.save_data(
+            tmp_dir, tables=None, save_total_table=True, file_format="feather"
+        )
+        file_path = os.path.join(tmp_dir, "TOTAL.feather")
+        assert os.path.isfile(file_path), f"{file_path} should exist"
+
+        table = feather.read_table(file_path)
+        assert (
+            table.num_columns == 21
+        ), "Should save all sensors from internal and faros"
+        assert (
+            table.num_rows == 18518
+        ), "Should create exact number of synced result items"
+
+
+def test_happy_path_save_csv(faros_sync):
+    synchronizer = faros_sync
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tables = {"ECG": {"Faros": ["ECG"]}}
+        synchronizer.save_data(tmp_dir, tables=tables, save_total_table=True)
+
+        table = pacsv.read_csv(os.path.join(tmp_dir, "ECG.csv"))
+        assert table.num_rows == 15100, "Should have saved all ecg values"
+        assert table.column_names == [
+            "timestamp",
+            "Faros_ECG",
+        ], "Should have saved timestamp and ecg column"
+
+        table = pacsv.read_csv(os.path.join(tmp_dir, "TOTAL.csv"))
+        assert (
+            table.num_columns == 21
+        ), "Should save all sensors from internal and faros"
+        assert (
+            table.num_rows == 18518
+        ), "Should create exact number of synced result items"
+
+
+def test_happy_path_save_total_table_parquet(faros_sync, monkeypatch):
+    synchronizer = faros_sync
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with pytest.raises(ValueError):
+            synchronizer.save_data(tmp_dir, file_format="xlsx")
+
+        # write the total table in multiple chunks
+        monkeypatch.setattr(synchronizer, "total_table_chunk_size", 1000)
+        synchronizer.save_data(
+            tmp_dir, tables=None, save_total_table=True, file_format="parquet"
+        )
+        assert os.path.isfile(os.path.join(tmp_dir, "SYNC.csv"))
+        file_path = os.path.join(tmp_dir, "TOTAL.parquet")
+        assert os.path.isfile(file_path), f"{file_path} should exist"
+
+        df = pd.read_parquet(file_path)
+        assert isinstance(df.index, pd.DatetimeIndex), "Should keep the index"
+        assert len(df.columns) == 20, "Should save all sensors from internal and faros"
+        assert len(df) == 18518, "Should create exact number of synced result items"
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_save_data_without_pyarrow(faros_sync, monkeypatch, file_format):
+    # make importing pyarrow fail
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with pytest.raises(ImportError):
+            faros_sync.save_data(tmp_dir, file_format=file_format)
+        assert os.listdir(tmp_dir) == [], "Should not write a partial export"
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_save_total_table_late_object_columns(faros_sync, monkeypatch, file_format):
+    index = pd.date_range("2021-01-01", periods=6, freq="s", tz="UTC")
+    synced_data = {
+        "A": pd.DataFrame(
+            {"s": ["a", "b", "c"], "b": [True, False, True]}, index=index[3:]
+        ),
+        "B": pd.DataFrame({"x": np.arange(6.0)}, index=index),
+    }
+    # the object columns of A have no values in the first chunks
+    monkeypatch.setattr(faros_sync, "total_table_chunk_size", 2)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        faros_sync._save_total_table(synced_data, tmp_dir, file_format)
+        file_path = os.path.join(tmp_dir, f"TOTAL.{file_format}")
+        if file_format == "parquet":
+            df = pd.read_parquet(file_path)
+        else:
+            df = pd.read_feather(file_path)
+
+    assert len(df) == 6, "Should save all rows"
+    assert df["A_s"].tolist()[3:] == ["a", "b", "c"], "Should save late strings"
+    assert df["A_b"].tolist()[3:] == [True, False, True], "Should save late bools"
+    assert df["A_s"].iloc[:3].isna().all(), "Should save missing values"
+
+
+def test_reference_signal_dtype(base_data):
+    sources = {
+        "A": {"data": base_data.copy(), "ref_column": "ACCELERATION_Z"},
+        "B": {"data": base_data, "ref_column": "ACCELERATION_Z"},
+    }
+
+    synchronizer = jointly.Synchronizer(sources, "A")
+    assert (
+        synchronizer.ref_signals.dtypes == np.float32
+    ).all(), "Should use single precision by default"
+
+    synchronizer = jointly.Synchronizer(sources, "A", dtype=np.float64)
+    assert (
+        synchronizer.ref_signals.dtypes == np.float64
+    ).all(), "Should use the requested precision"
+
+
+def test_synced_data_reference_not_copied(base_data):
+    reference_signal, target_signal = "A", "B"
     sources = {
-        reference_signal: {"data": ref_data, "ref_column": "ACCELERATION_Z"},
-        target_signal: {"data": target_data, "ref_column": "ACCELERATION_Z"},
+        reference_signal: {"data": base_data.copy(), "ref_column": "ACCELERATION_Z"},
+        target_signal: {"data": base_data, "ref_column": "ACCELERATION_Z"},
     }
     extractor = ShakeExtractor()
-    extractor.start_window_length = pd.Timedelta(seconds=17)
-    extractor.end_window_length = pd.Timedelta(seconds=10)
+    extractor.start_window_length = pd.Timedelta(seconds=5)
+    extractor.end_window_length = pd.Timedelta(seconds=3)
     extractor.min_length = 3
-    extractor.threshold = 0.19
+    extractor.threshold = 0.5
+
+    synchronizer = jointly.Synchronizer(sources, reference_signal, extractor)
+    synced_data = synchronizer.get_synced_data()
+
+    assert (
+        synced_data[reference_signal] is sources[reference_signal]["data"]
+    ), "Should return the reference data without stretching, shifting or copying it"
+    assert synced_data[target_signal].equals(base_data), "Should not change equal data"
+
+
+def test_synced_data_cached(base_data):
+    reference_signal, target_signal = "A", "B"
+    sources = {
+        reference_signal: {"data": base_data.copy(), "ref_column": "ACCELERATION_Z"},
+        target_signal: {
+            "data": base_data.shift(-22, freq="100ms"),
+            "ref_column": "ACCELERATION_Z",
+        },
+    }
+    extractor = ShakeExtractor()
+    extractor.start_window_length = pd.Timedelta(seconds=5)
+    extractor.end_window_length = pd.Timedelta(seconds=3)
+    extractor.min_length = 3
+    extractor.threshold = 0.5
 
     synchronizer = jointly.Synchronizer(sources, reference_signal, extractor)
+    synced_data = synchronizer.get_synced_data()
+    assert (
+        synchronizer.get_synced_data()[target_signal] is synced_data[target_signal]
+    ), "Should reuse the synced data"
+
     with tempfile.TemporaryDirectory() as tmp_dir:
-        synchronizer.save_data(tmp_dir, tables=None, save_total_table=True)
-        file_path = os.path.join(tmp_dir, "TOTAL.csv")
-        assert os.path.isfile(file_path), f"{file_path} should exist"
+        saved_data = synchronizer.save_pickles(tmp_dir)
+    assert (
+        saved_data[target_signal] is synced_data[target_signal]
+    ), "Should save the cached synced data"
 
-        df = pd.read_csv(file_path)
-        assert len(df.columns) == 21, "Should save all sensors from internal and faros"
-        assert len(df) == 18518, "Should create exact number of synced result items"
+    recalculated_data = synchronizer.get_synced_data(recalculate=True)
+    assert (
+        recalculated_data[target_signal] is not synced_data[target_signal]
+    ), "Should synchronize again when recalculating"
+    assert recalculated_data[target_signal].equals(synced_data[target_signal])